@@ -1,12 +1,24 @@
 import re
 import unicodedata
+from bisect import bisect_left
 from functools import lru_cache
-from typing import List, Tuple, Optional
+from itertools import accumulate, islice
+from operator import itemgetter
+from typing import FrozenSet, List, Tuple, Optional
 
 # ------------------------------
 # Normalization & Cleaning
 # ------------------------------
 
+_RE_INNER_PUNCT = re.compile(r'(?<=\w)[^\w\s]+(?=\w)', re.UNICODE)
+# Any run of punctuation, whitespace and/or underscores collapses to one separator space
+# (\w includes '_', so it is listed explicitly)
+_RE_SEP = re.compile(r'[\W_]+', re.UNICODE)
+
+# Inputs shorter than this are memoized by clean_text (band names, short lyrics);
+# longer ones are cleaned every time so the cache never pins big lyrics in memory.
+_CLEAN_CACHE_MAX_LEN = 4096
+
 def normalize_text(s: str) -> str:
     """
     Unicode compatibility normalization (NFKC).
@@ -24,22 +36,22 @@ def clean_text(s: str) -> str:
     - All other punctuation becomes spaces (acts as separators).
     - Preserves accents (é remains).
     """
+    if len(s) < _CLEAN_CACHE_MAX_LEN:
+        return _clean_text_cached(s)
+    return _clean_text(s)
+
+def _clean_text(s: str) -> str:
     s = normalize_text(s)
-    s = s.replace("\n", " ")
 
     # Join inner punctuation: keep word intact when punctuation is between word chars
-    s = re.sub(r'(?<=\w)[^\w\s]+(?=\w)', '', s, flags=re.UNICODE)
-
-    # Other punctuation -> spaces
-    s = re.sub(r'[^\w\s]+', ' ', s, flags=re.UNICODE)
-
-    # Treat underscores as spaces (since \w includes '_')
-    s = s.replace('_', ' ')
+    s = _RE_INNER_PUNCT.sub('', s)
 
-    # Collapse spaces and lowercase
-    s = re.sub(r'\s+', ' ', s).strip().lower()
+    # Other punctuation, underscores and whitespace (newlines included) -> single spaces; lowercase
+    s = _RE_SEP.sub(' ', s).strip().lower()
     return s
 
+_clean_text_cached = lru_cache(maxsize=1024)(_clean_text)
+
 # ------------------------------
 # Helpers
 # ------------------------------
@@ -73,10 +85,230 @@ def segment_score(anchor_col: int, seg_len: int, min_len: int, max_len: int) ->
         length_penalty += (seg_len - max_len) * 2.0
     return abs(anchor_col - center) + length_penalty
 
+# Sort key for candidate tuples (score first); C-level instead of a per-item lambda
+_score = itemgetter(0)
+
+@lru_cache(maxsize=32)
+def prepare_lyrics(lyrics: str) -> Tuple[Tuple[str, ...], Tuple[int, ...], FrozenSet[str]]:
+    """
+    Cleaned words of the lyrics, prefix sums of their lengths
+    (cumlen[i] = total length of words[:i]) for O(1) segment length, and the
+    set of characters present in the cleaned text.
+    Cached so repeated calls with the same lyrics (e.g. different band names)
+    skip cleaning, splitting and the prefix sums.
+    """
+    text = clean_text(lyrics)
+    words = tuple(text.split())
+    cumlen = tuple(accumulate(map(len, words), initial=0))
+    return words, cumlen, frozenset(text)
+
 # ------------------------------
 # Main
 # ------------------------------
 
+class _Solver:
+    """
+    DP state for one (words, band) pair, shared across all growth steps.
+    candidates/solve take max_cap as part of their cache key, so one solver serves
+    every cap; cap-independent work (anchor per word/char, words containing each
+    char) is precomputed once and reused as the cap grows.
+    """
+
+    TOP_K = 8  # prune branching, but we force-keep 'j-alone'
+
+    def __init__(self, words: Tuple[str, ...], cumlen: Tuple[int, ...], band: str, min_chars: int):
+        self.words = words
+        self.cumlen = cumlen
+        self.band = band
+        self.n, self.m = len(words), len(band)
+        self.min_chars = min_chars
+        n = self.n
+
+        # One pass over the words: anchor index per (word, band char), per band char the
+        # sorted indices of the words containing it, and per word a bitmask of the band
+        # chars it contains (one bit per distinct band char, so no false positives).
+        # The DP never rescans a word.
+        band_chars = set(band)
+        char_bits = {ch: 1 << k for k, ch in enumerate(band_chars)}
+        anchors = {}
+        containing = {ch: [] for ch in band_chars}
+        word_masks = [0] * n
+        for wi, w in enumerate(words):
+            mask = 0
+            for ch in band_chars.intersection(w):
+                anchors[(wi, ch)] = choose_anchor_index(w, ch)
+                containing[ch].append(wi)
+                mask |= char_bits[ch]
+            word_masks[wi] = mask
+        self.anchors = anchors
+        self.containing = containing
+        self.char_bits = char_bits
+        self.word_masks = word_masks
+
+        # Memo tables keyed on (i, pos, max_cap), filled by solve(). Plain dicts probed
+        # inline are cheaper per lookup than an lru_cache wrapper around each call.
+        self._cand_memo = {}
+        self._solve_memo = {}
+
+    def candidates(self, i: int, pos: int, max_cap: int):
+        """
+        Candidate segments for band letter i starting at word index pos.
+        Returns tuples:
+          (score, a, e, j, anchor_idx_in_word, anchor_col, seg_len_chars)
+
+        Constraints:
+          - a == pos always.
+          - If i == 0: j MUST equal a (first printed word is first anchor word).
+          - If i == m-1: e MUST equal j (last printed word is last anchor word).
+          - Always include the 'j-alone' candidate (e == j), even if short/scored worse.
+        """
+        band, cumlen, anchors = self.band, self.cumlen, self.anchors
+        n, m, min_chars = self.n, self.m, self.min_chars
+        ch = band[i]
+        out = []
+        if pos >= n:
+            return tuple()
+
+        # Every segment starts at pos, so the length (with spaces) of words pos..b is
+        # cumlen[b + 1] + b - base: a single prefix subtraction, inlined below.
+        base = cumlen[pos] + pos
+
+        # Helper to compute one candidate for a given end 'ee'
+        def make_candidate(a: int, j: int, ee: int, anchor_in_word: int):
+            chars_before_anchor = cumlen[j] + j - base
+            anchor_col = chars_before_anchor + anchor_in_word
+            L = cumlen[ee + 1] + ee - base
+            sc = segment_score(anchor_col, L, min_chars, max_cap)
+            return (sc, a, ee, j, anchor_in_word, anchor_col, L)
+
+        if i == 0:
+            j_range = (pos,) if self.word_masks[pos] & self.char_bits[ch] else ()
+        else:
+            # Jump straight to the words at/after pos that contain ch
+            containing = self.containing[ch]
+            j_range = islice(containing, bisect_left(containing, pos), None)
+        for j in j_range:
+            len_j = cumlen[j + 1] + j - base
+            if len_j > max_cap:
+                break
+            anchor_in_word = anchors[(j, ch)]
+
+            forced_alone = None  # store 'e == j' candidate to force-keep later
+
+            if i == m - 1:
+                # LAST LINE: must end at the anchor word
+                if len_j <= max_cap:
+                    forced_alone = make_candidate(pos, j, j, anchor_in_word)
+                    out.append(forced_alone)
+            else:
+                # Non-last lines:
+                # 1) Forced 'j-alone' candidate (may be short)
+                if len_j <= max_cap:
+                    forced_alone = make_candidate(pos, j, j, anchor_in_word)
+                    out.append(forced_alone)
+
+                # 2) Candidates extended to reach >= min_chars (if possible), plus a couple longer
+                e = j
+                while e < n:
+                    L = cumlen[e + 1] + e - base
+                    if L >= min_chars or L > max_cap:
+                        break
+                    e += 1
+                e0 = e if e < n and cumlen[e + 1] + e - base <= max_cap else max(j, e - 1)
+
+                tried = set()
+                for off in range(0, 3):
+                    ee = e0 + off
+                    if ee >= n:
+                        break
+                    L = cumlen[ee + 1] + ee - base
+                    if L > max_cap:
+                        break
+                    if (ee, j) in tried:
+                        continue
+                    tried.add((ee, j))
+                    out.append(make_candidate(pos, j, ee, anchor_in_word))
+
+        if not out:
+            return tuple()
+
+        # Sort by score, take top-K
+        out.sort(key=_score)
+        kept = out[:self.TOP_K]
+
+        # Ensure 'j-alone' candidate(s) are kept (force-keep) for every j we considered
+        # (We already included them in 'out'; just ensure not pruned.)
+        # Collect forced 'e==j' per unique j
+        forced = []
+        seen_j = set()
+        for cand in out:
+            _, a, ee, j, _, _, _ = cand
+            if ee == j and (j not in seen_j):
+                forced.append(cand)
+                seen_j.add(j)
+
+        # Merge: keep = top-K ∪ forced_alone (dedup by object identity)
+        n_top = len(kept)
+        signature = {(a, e, j, idx, col, L) for _, a, e, j, idx, col, L in kept}
+        for cand in forced:
+            _, a, ee, j, idx, col, L = cand
+            key = (a, ee, j, idx, col, L)
+            if key not in signature:
+                kept.append(cand)
+                signature.add(key)
+
+        # Final sort (stable by score); the top-K slice is already in order, so only
+        # re-sort when forced candidates were appended after it
+        if len(kept) > n_top:
+            kept.sort(key=_score)
+        return tuple(kept)
+
+    def solve(self, i: int, pos: int, max_cap: int):
+        """
+        DP over lines i..m-1 starting at word index pos.
+        Returns (cost, choice) where choice is this line's (a,e,j,anchor_idx,anchor_col),
+        or None if infeasible. The next line starts at e + 1; walk the choices with path().
+        """
+        INF = (10**9, None)
+        m = self.m
+        if i == m:
+            return (0.0, None)
+        solve_memo = self._solve_memo
+        key = (i, pos, max_cap)
+        best = solve_memo.get(key)
+        if best is not None:
+            return best
+
+        best = INF
+        cands = self._cand_memo.get(key)
+        if cands is None:
+            cands = self._cand_memo[key] = self.candidates(i, pos, max_cap)
+        for (sc, a, e, j, aidx, acol, L) in cands:
+            if i + 1 == m:
+                nxt_cost = 0.0
+            else:
+                nxt = solve_memo.get((i + 1, e + 1, max_cap))
+                nxt_cost = (nxt if nxt is not None else self.solve(i + 1, e + 1, max_cap))[0]
+            if nxt_cost >= 1e9:
+                continue
+            total = sc + nxt_cost
+            if total < best[0]:
+                best = (total, (a, e, j, aidx, acol))
+        solve_memo[key] = best
+        return best
+
+    def path(self, pos: int, max_cap: int) -> List[Tuple[int, int, int, int, int]]:
+        """
+        Follow the choices recorded by solve(0, pos, max_cap) (which must be feasible)
+        and return the full solution: one (a,e,j,anchor_idx,anchor_col) per line.
+        """
+        sol = []
+        for i in range(self.m):
+            choice = self.solve(i, pos, max_cap)[1]
+            sol.append(choice)
+            pos = choice[1] + 1
+        return sol
+
 def arrange_lyrics_chat_gpt(
     lyrics: str,
     band_name: str,
@@ -98,175 +330,42 @@ def arrange_lyrics_chat_gpt(
         # Try compact first, relax if needed
         growth_steps = [max_chars, max_chars + 8, max_chars + 16, max_chars + 24, 120]
 
-    text = clean_text(lyrics)
+    words, cumlen, present = prepare_lyrics(lyrics)
     band = clean_text(band_name).replace(" ", "")
-    if not text or not band:
+    if not words or not band:
+        return "CANNOT_ASSEMBLE"
+
+    # Some band letter never occurs in the lyrics: no growth step can succeed, skip the DP
+    if not present.issuperset(band):
         return "CANNOT_ASSEMBLE"
 
-    words = text.split()
     n, m = len(words), len(band)
     if n == 0 or m == 0:
         return "CANNOT_ASSEMBLE"
 
-    # Prefix sums of word lengths for O(1) segment length (with spaces)
-    cumlen = [0] * (n + 1)
-    for i in range(n):
-        cumlen[i + 1] = cumlen[i] + len(words[i])
+    solver = _Solver(words, cumlen, band, min_chars)
 
-    def seg_len(a: int, b: int) -> int:
-        return (cumlen[b + 1] - cumlen[a]) + (b - a)
+    # Start positions must contain the first band letter (independent of max_cap)
+    starts = solver.containing[band[0]]
+    if not starts:
+        return "CANNOT_ASSEMBLE"
 
     for max_cap in growth_steps:
-
-        @lru_cache(maxsize=None)
-        def candidates(i: int, pos: int):
-            """
-            Candidate segments for band letter i starting at word index pos.
-            Returns tuples:
-              (score, a, e, j, anchor_idx_in_word, anchor_col, seg_len_chars)
-
-            Constraints:
-              - a == pos always.
-              - If i == 0: j MUST equal a (first printed word is first anchor word).
-              - If i == m-1: e MUST equal j (last printed word is last anchor word).
-              - Always include the 'j-alone' candidate (e == j), even if short/scored worse.
-            """
-            ch = band[i]
-            out = []
-            if pos >= n:
-                return tuple()
-
-            # Helper to compute one candidate for a given end 'ee'
-            def make_candidate(a: int, j: int, ee: int, anchor_in_word: int):
-                chars_before_anchor = (cumlen[j] - cumlen[a]) + (j - a)
-                anchor_col = chars_before_anchor + anchor_in_word
-                L = seg_len(a, ee)
-                sc = segment_score(anchor_col, L, min_chars, max_cap)
-                return (sc, a, ee, j, anchor_in_word, anchor_col, L)
-
-            TOP_K = 8  # prune branching, but we force-keep 'j-alone'
-
-            j_range = [pos] if i == 0 else range(pos, n)
-            for j in j_range:
-                if seg_len(pos, j) > max_cap:
-                    break
-                if ch not in words[j]:
-                    if i == 0:
-                        break
-                    continue
-                anchor_in_word = choose_anchor_index(words[j], ch)
-                if anchor_in_word is None:
-                    if i == 0:
-                        break
-                    continue
-
-                forced_alone = None  # store 'e == j' candidate to force-keep later
-
-                if i == m - 1:
-                    # LAST LINE: must end at the anchor word
-                    if seg_len(pos, j) <= max_cap:
-                        forced_alone = make_candidate(pos, j, j, anchor_in_word)
-                        out.append(forced_alone)
-                else:
-                    # Non-last lines:
-                    # 1) Forced 'j-alone' candidate (may be short)
-                    if seg_len(pos, j) <= max_cap:
-                        forced_alone = make_candidate(pos, j, j, anchor_in_word)
-                        out.append(forced_alone)
-
-                    # 2) Candidates extended to reach >= min_chars (if possible), plus a couple longer
-                    e = j
-                    while e < n and seg_len(pos, e) < min_chars and seg_len(pos, e) <= max_cap:
-                        e += 1
-                    e0 = e if e < n and seg_len(pos, e) <= max_cap else max(j, e - 1)
-
-                    tried = set()
-                    for off in range(0, 3):
-                        ee = e0 + off
-                        if ee >= n:
-                            break
-                        L = seg_len(pos, ee)
-                        if L > max_cap:
-                            break
-                        if (ee, j) in tried:
-                            continue
-                        tried.add((ee, j))
-                        out.append(make_candidate(pos, j, ee, anchor_in_word))
-
-            if not out:
-                return tuple()
-
-            # Sort by score, take top-K
-            out.sort(key=lambda t: t[0])
-            kept = out[:TOP_K]
-
-            # Ensure 'j-alone' candidate(s) are kept (force-keep) for every j we considered
-            # (We already included them in 'out'; just ensure not pruned.)
-            # Collect forced 'e==j' per unique j
-            forced = []
-            seen_j = set()
-            for cand in out:
-                _, a, ee, j, _, _, _ = cand
-                if ee == j and (j not in seen_j):
-                    forced.append(cand)
-                    seen_j.add(j)
-
-            # Merge: keep = top-K ∪ forced_alone (dedup by object identity)
-            signature = {(a, e, j, idx, col, L) for _, a, e, j, idx, col, L in kept}
-            for cand in forced:
-                _, a, ee, j, idx, col, L = cand
-                key = (a, ee, j, idx, col, L)
-                if key not in signature:
-                    kept.append(cand)
-                    signature.add(key)
-
-            # Final sort (stable by score)
-            kept.sort(key=lambda t: t[0])
-            return tuple(kept)
-
-        @lru_cache(maxsize=None)
-        def solve(i: int, pos: int):
-            """
-            DP over lines i..m-1 starting at word index pos.
-            Returns (cost, solution_tuple) where solution_tuple is a sequence of
-            (a,e,j,anchor_idx,anchor_col).
-            """
-            INF = (10**9, ())
-            if i == m:
-                return (0.0, ())
-            best = INF
-            cands = candidates(i, pos)
-            if not cands:
-                return INF
-            for (sc, a, e, j, aidx, acol, L) in cands:
-                nxt_cost, nxt_sol = solve(i + 1, e + 1)
-                if nxt_cost >= 1e9:
-                    continue
-                total = sc + nxt_cost
-                if total < best[0]:
-                    best = (total, ((a, e, j, aidx, acol),) + nxt_sol)
-            return best
-
-        # Start positions must contain the first band letter
-        starts = [p for p in range(n) if band[0] in words[p]]
-        if not starts:
-            continue
-
         best_overall = (10**9, None)
         for pos0 in starts:
-            cost, sol = solve(0, pos0)
+            cost, _ = solver.solve(0, pos0, max_cap)
             if cost < best_overall[0]:
-                best_overall = (cost, sol)
+                best_overall = (cost, pos0)
 
         if best_overall[1] is None:
             continue
 
         # Reconstruct & align
-        sol = best_overall[1]
+        sol = solver.path(best_overall[1], max_cap)
         target_col = max(acol for (_, _, _, _, acol) in sol)
         lines = []
         for (a, e, j, aidx, acol) in sol:
-            seg_words = words[a : e + 1]
+            seg_words = list(words[a : e + 1])
             # Uppercase the anchor *letter* (digits remain digits)
             aw = list(seg_words[j - a])
             if 0 <= aidx < len(aw):
@@ -278,100 +377,9 @@ def arrange_lyrics_chat_gpt(
 
     return "CANNOT_ASSEMBLE"
 
-# ==========================================
-# ================ EXAMPLES ================
-# ==========================================
-lyrics_1 = "...I bomb atomically, socrates, ^^^philosophies and hypoth&&&ses can't define h***ow I be dropping these mockeries..."
-band_name_1 = "cebi"
-
-lyrics_2 = """
-Alice was beginning to get very tired of sitting by her sister on the bank,
-and of having nothing to do: once or twice she had peeped into the book her
-sister was reading, but it had no pictures or conversations in it, “and what
-is the use of a book,” thought Alice “without pictures or conversations?”
-
-So she was considering in her own mind (as well as she could, for the hot day
-made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain
-would be worth the trouble of getting up and picking the daisies, when suddenly a
-White Rabbit with pink eyes ran close by her.
-"""
-band_name_2 = "alice"
-
-lyrics_3 = "a a a a a b b b b b c c c c c"
-band_name_3 = "abc"
-
-lyrics_4 = "aaaaa bbbbb x ccccc a bb c"
-band_name_4 = "abc"
-
-# Returns "CANNOT_ASSEMBLE" if band name longer than lyrics
-lyrics_5 = "aaa"
-band_name_5 = "aaaa"
-
-# Returns "CANNOT_ASSEMBLE" if band name not in lyrics
-lyrics_6 = "aaa bbb"
-band_name_6 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if band name empty
-lyrics_7 = ""
-band_name_7 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if lyrics empty
-lyrics_8 = ""
-band_name_8 = "aba"
-
-lyrics_9 = "zócalo ola kíndër ejemplo mañana tvityv tótem hjboyu internet niño gélido"
-band_name_9 = "Zoë Eñótié"
-
-lyrics_10 = "zócalo          ola kíndër ejemplo mañana          tvityv tótem hjboyu internet niño gélido"
-band_name_10 = "Zoë       Eñótié"
-
-lyrics_11 = "ﬁancé ① ＡＢＣ１２３ x² + y³"
-band_name_11 = "i1bx3"
-
-lyrics_12 = "Прекрасное объяснение. Тема сложная, конечно, но лучше никто объяснить не сможет."
-band_name_12 = "Т чл ибж"
-
-print(arrange_lyrics_chat_gpt(lyrics_1, band_name_1))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_2, band_name_2))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_3, band_name_3))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_4, band_name_4))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_5, band_name_5))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_6, band_name_6))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_7, band_name_7))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_8, band_name_8))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_9, band_name_9))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_10, band_name_10))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_11, band_name_11))
-print("\n")
-print(arrange_lyrics_chat_gpt(lyrics_12, band_name_12))
-print("\n")
-
-
-# ======================================
-# ================ TIMER ===============
-# ======================================
-import timeit
-
-N = 10000
-total = timeit.timeit(
-    stmt="arrange_lyrics_chat_gpt(lyrics, band_name)",
-    setup="""
-from __main__ import arrange_lyrics_chat_gpt
-lyrics = "Alice was beginning to get very tired of sitting by her sister on the bank, and of having nothing to do: once or twice she had peeped into the book hersister was reading, but it had no pictures or conversations in it, “and what is the use of a book,” thought Alice “without pictures or conversations?” So she was considering in her own mind (as well as she could, for the hot day made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain would be worth the trouble of getting up and picking the daisies, when suddenly a White Rabbit with pink eyes ran close by her."
-band_name = "alice"
-""",
-    number=N
-)
-
-avg_ms = (total / N) * 1000
-print(f"Average execution time: {avg_ms:.9f} ms")
\ No newline at end of file
+
+if __name__ == "__main__":
+    from lyrics_examples import print_average_time, print_examples
+
+    print_examples(arrange_lyrics_chat_gpt)
+    print_average_time(arrange_lyrics_chat_gpt)
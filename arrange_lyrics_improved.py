@@ -1,37 +1,83 @@
+import re
 import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import lru_cache, partial
+from itertools import accumulate, compress, islice
+from operator import add, ne, sub
 
 CANNOT_ASSEMBLE = "CANNOT_ASSEMBLE"
 
+# Band names up to this length find their letters with str.find over the joined lyrics
+# instead of indexing every character of every word (which only pays off for longer ones)
+_FIND_MAX_BAND_LEN = 5
+
+# Inputs shorter than this are memoized by clean_text (band names, short lyrics);
+# longer ones are cleaned every time so the cache never pins big lyrics in memory.
+_CLEAN_CACHE_MAX_LEN = 4096
+
+# \w is exactly str.isalnum() plus "_", and \s is exactly str.isspace(), so these
+# drop the same characters as the per-char isalnum()/isspace() filters would.
+_RE_NOT_ALNUM = re.compile(r'[\W_]+')
+_RE_NOT_ALNUM_OR_SPACE = re.compile(r'(?:[^\w\s]|_)+')
+
+def _build_ascii_table(keep_spaces):
+    """
+    str.translate table for ASCII text: drop what the regexes above drop, fold A-Z to a-z,
+    and (when spaces are kept) turn "\n" into " " like the slow path does.
+    """
+    table = {}
+    for c in range(128):
+        ch = chr(c)
+        if ch.isalnum():
+            table[c] = ord(ch.lower())
+        elif not (keep_spaces and ch.isspace()):
+            table[c] = None
+    if keep_spaces:
+        table[ord("\n")] = ord(" ")
+    return table
+
+# One C-level pass that filters and lowercases, used whenever the normalized text is ASCII
+_ASCII_LYRICS_TABLE = _build_ascii_table(keep_spaces=True)
+_ASCII_BANDNAME_TABLE = _build_ascii_table(keep_spaces=False)
+
+# Results depend only on the two strings, so repeated (lyrics, band_name) pairs are a dict lookup
+@lru_cache(maxsize=1024)
 def arrange_lyrics_improved(lyrics, band_name):
   # Guard: empty input(s)
   if not lyrics or not band_name:
     return CANNOT_ASSEMBLE
   
   # 1) Clean + lowercase inputs
-  lyrics = clean_text(lyrics)
+  # 2) Split lyrics into words and index them (cached per lyrics, so treat both as read-only).
+  #    Short band names find just their own letters with str.find over the joined text;
+  #    longer ones use the inverted index of every character.
   band_name = clean_text(band_name, True)
-
-  # 2) Split lyrics into words
-  words = lyrics.split()
+  if len(band_name) <= _FIND_MAX_BAND_LEN:
+    words, text, word_starts = split_lyrics(lyrics)
+    index = {ch: find_letter_in_words(text, word_starts, ch) for ch in set(band_name)}
+  else:
+    words, index = index_lyrics(lyrics)
 
   # Guard: band name longer than available words
   if len(band_name) > len(words):
     return CANNOT_ASSEMBLE
 
-  # 3) For each letter in band_name, make a list of tuples of the index of words 
+  # 3) For each letter in band_name, get two parallel int lists: the index of words
   #    where it occurs, and the first index of the letter within that word.
   # E.g.
   # band_name = "abc"
   # words = ["xxaxx", "abxxc", "bcx"]
   # layers = [
-  #   [(0, 2), (1, 0)], # a
-  #   [(1, 1), (2, 0)], # b
-  #   [(1, 4), (2, 1)], # c
+  #   ([0, 1], [2, 0]), # a
+  #   ([1, 2], [1, 0]), # b
+  #   ([1, 2], [4, 1]), # c
   # ]
+  #    These come straight from the index built in step 2.
   layers = []
   for ch in band_name:
-      occurrences = get_first_occurrences_of_letter_in_words(words, ch)
-      if not occurrences:
+      occurrences = index.get(ch)
+      if not occurrences or not occurrences[0]:
           return CANNOT_ASSEMBLE
       layers.append(occurrences)
 
@@ -43,18 +89,39 @@ def arrange_lyrics_improved(lyrics, band_name):
     return CANNOT_ASSEMBLE
 
   # 5) Construct lines
-  lines = []
-  for i in range(1, len(best_selection)):
-    start_index, pos_of_letter_in_word = best_selection[i-1]
-    end_index, _ = best_selection[i]
-    # Capitalize the letter in the word
-    words[start_index] = capitalize_letter_in_word(words[start_index], pos_of_letter_in_word)
-    line = " ".join(words[start_index:end_index])
-    lines.append(line)
-  # Construct and append last word
-  last_word_index, pos = best_selection[-1]
-  words[last_word_index] = capitalize_letter_in_word(words[last_word_index], pos)
-  lines.append(words[last_word_index])
+  first_index = best_selection[0][0]
+  span_words = words[first_index:best_selection[-1][0] + 1]
+  text = " ".join(span_words)
+  is_ascii = text.isascii()
+  if is_ascii:
+    # Capitalize every letter in one bytearray of the joined span, then cut the lines out
+    # of it as zero-copy views. Word r of the span starts at offset cumlen[r] + r.
+    cumlen = list(accumulate(map(len, span_words), initial=0))
+    buf = bytearray(text, "ascii")
+    offsets = []
+    for word_index, pos in best_selection:
+      r = word_index - first_index
+      offset = cumlen[r] + r
+      if 97 <= buf[offset + pos] <= 122:
+        buf[offset + pos] &= 0x5F
+      offsets.append(offset)
+    text = memoryview(buf)
+    lines = [text[offsets[i-1]:offsets[i] - 1] for i in range(1, len(offsets))]
+    lines.append(text[offsets[-1]:])
+  else:
+    words = list(words)
+    lines = []
+    for i in range(1, len(best_selection)):
+      start_index, pos_of_letter_in_word = best_selection[i-1]
+      end_index, _ = best_selection[i]
+      # Capitalize the letter in the word
+      words[start_index] = capitalize_letter_in_word(words[start_index], pos_of_letter_in_word)
+      line = " ".join(words[start_index:end_index])
+      lines.append(line)
+    # Construct and append last word
+    last_word_index, pos = best_selection[-1]
+    words[last_word_index] = capitalize_letter_in_word(words[last_word_index], pos)
+    lines.append(words[last_word_index])
 
   # 6) Determine padding to align vertically
   left_buffer = 0
@@ -64,15 +131,27 @@ def arrange_lyrics_improved(lyrics, band_name):
     right_buffer = max(right_buffer, len(line) - 1 - best_selection[i][1])
 
   # 7) Add the buffers to the lines
-  for i, line in enumerate(lines):
-    needed_left_buffer = left_buffer - best_selection[i][1]
-    needed_right_buffer = right_buffer - (len(line) - 1 - best_selection[i][1])
-    if not needed_left_buffer and not needed_right_buffer:
-      continue
-    line_left_buffer = " " * needed_left_buffer
-    line_right_buffer = " " * needed_right_buffer
-    lines[i] = line_left_buffer + line + line_right_buffer
-  
+  #    Every padded line is exactly `width` wide.
+  width = left_buffer + right_buffer + 1
+  if is_ascii:
+    # ASCII lines are byte views: write them all into one space-filled buffer at fixed
+    # row offsets instead of concatenating per line.
+    out = bytearray(b" ") * (len(lines) * (width + 1) - 1)
+    row = 0
+    for i, line in enumerate(lines):
+      col = row + left_buffer - best_selection[i][1]
+      out[col:col + len(line)] = line
+      row += width + 1
+      if row < len(out):
+        out[row - 1] = 10  # "\n"
+    return out.decode("ascii")
+
+  # Otherwise pad with C-level rjust/ljust: shift the letter to column left_buffer,
+  # then fill out to the full width
+  lines = [
+    line.rjust(left_buffer - best_selection[i][1] + len(line)).ljust(width)
+    for i, line in enumerate(lines)
+  ]
   return "\n".join(lines)
 
 
@@ -85,6 +164,14 @@ def clean_text(s: str, remove_spaces: bool = False) -> str:
     If remove_spaces=True, drop spaces also (e.g. for band_name); else keep spaces (e.g. for lyrics).
     E.g. s = ...abc^@#$%^123... → s = abc123
     """
+    if len(s) < _CLEAN_CACHE_MAX_LEN:
+        return _clean_text_cached(s, remove_spaces)
+    return _clean_text(s, remove_spaces)
+
+def _clean_text(s: str, remove_spaces: bool) -> str:
+    # ASCII is already NFKC-normal: skip normalization and go straight to the one-pass translate
+    if s.isascii():
+        return s.translate(_ASCII_BANDNAME_TABLE if remove_spaces else _ASCII_LYRICS_TABLE)
     s = s.replace("\n", " ")
     # The following line of code, with the "NFKC" argument, makes “quirky” characters become their plain forms first, so they don’t get dropped
     # Examples:
@@ -93,158 +180,117 @@ def clean_text(s: str, remove_spaces: bool = False) -> str:
     # x² + y³ → x2 + y3
     # Docs; https://docs.python.org/3/library/unicodedata.html#unicodedata.normalize
     s = unicodedata.normalize("NFKC", s)
+    if s.isascii():
+        return s.translate(_ASCII_BANDNAME_TABLE if remove_spaces else _ASCII_LYRICS_TABLE)
     if remove_spaces:
-        s = "".join(ch for ch in s if ch.isalnum())
+        s = _RE_NOT_ALNUM.sub("", s)
     else:
-        s = "".join(ch for ch in s if (ch.isalnum() or ch.isspace()))
-    return s.lower()
+        s = _RE_NOT_ALNUM_OR_SPACE.sub("", s)
+    return s if s.islower() else s.lower()
+
+_clean_text_cached = lru_cache(maxsize=1024)(_clean_text)
+
+@lru_cache(maxsize=32)
+def split_lyrics(lyrics):
+    """
+    Return (words, text, word_starts): the cleaned words of lyrics as a tuple, the same words
+    joined by single spaces, and the offset of every word in that text.
+    Cached so repeated calls with the same lyrics (e.g. different band names) skip cleaning
+    and splitting; the result is shared between calls, so treat it as read-only.
+    """
+    words = tuple(clean_text(lyrics).split())
+    word_starts = list(map(add, accumulate(map(len, words), initial=0), range(len(words))))
+    return words, " ".join(words), word_starts
 
-def get_first_occurrences_of_letter_in_words(words, letter):
-    """Return [(word_index, pos_in_word)] for the FIRST occurrence of letter in each word."""
-    out = []
+def find_letter_in_words(text, word_starts, ch):
+    """
+    Return (word_indexes, positions_in_word) of the FIRST occurrence of ch in each word, like
+    one entry of index_lyrics, using str.find over the joined text: after each hit the
+    search resumes at the next word, so only the words containing ch are visited.
+    """
+    wis, poss = [], []
+    last_wi = len(word_starts) - 1
+    p = text.find(ch)
+    while p != -1:
+        wi = bisect_right(word_starts, p) - 1
+        wis.append(wi)
+        poss.append(p - word_starts[wi])
+        if wi == last_wi:
+            break
+        p = text.find(ch, word_starts[wi + 1])
+    return wis, poss
+
+@lru_cache(maxsize=32)
+def index_lyrics(lyrics):
+    """
+    Return (words, index): the cleaned words of lyrics as a tuple, and an inverted index
+    {char: (word_indexes, positions_in_word)} of the FIRST occurrence of every character in each
+    word, as two parallel int lists in increasing word_index order (no per-entry tuples).
+    Built in one pass over the words, independent of the band name.
+    Cached so repeated calls with the same lyrics (e.g. different band names) skip cleaning,
+    splitting and indexing; the index is shared between calls, so treat it as read-only.
+    """
+    words = tuple(clean_text(lyrics).split())
+    index = defaultdict(lambda: ([], []))
+    # One pass over the characters: a char's word indexes already ending in this word means
+    # an earlier (first) occurrence was recorded, so later repeats are skipped.
     for wi, w in enumerate(words):
-        pos = w.find(letter)
-        if pos != -1:
-            out.append((wi, pos))
-    return out
+        for pos, ch in enumerate(w):
+            wis, poss = index[ch]
+            if not wis or wis[-1] != wi:
+                wis.append(wi)
+                poss.append(pos)
+    return words, index
 
 def get_min_range_of_words_having_letters(lists):
     """
-    lists: [ [(wi, pos), ...], ... ]
+    lists: [ (wis, poss), ... ] -- per layer, parallel int lists of word index and pos in word
+           (every layer non-empty: the caller returns CANNOT_ASSEMBLE for a missing letter)
+    Returns the selection as [(wi, pos), ...], one per layer.
     Objective: minimize (last_wi - first_wi).
-    Tie: keep the first encountered minimum (by iteration order).
+    Tie: keep the earliest start (the first minimum of the span list).
+
+    Advances every start through the layers together: per layer, one map of bisect_right
+    over all current ends picks each start's first wi > its previous pick.
     """
-    if not lists or any(not lst for lst in lists):
+    if not lists:
         return None
 
-    best = None
-    best_span = float('inf')
-
-    for start_wi, start_pos in lists[0]:
-        sel = [(start_wi, start_pos)]
-        prev_wi = start_wi
-        feasible = True
-
-        # For each subsequent layer, linearly find the first wi > prev_wi
-        for arr in lists[1:]:
-            j = 0
-            while j < len(arr) and arr[j][0] <= prev_wi:
-                j += 1
-            if j == len(arr):
-                feasible = False
-                break
-            wi, pos = arr[j]
-            sel.append((wi, pos))
-            prev_wi = wi
-
-        if not feasible:
-            continue
-
-        span = sel[-1][0] - sel[0][0]
-        if span < best_span:
-            best = sel
-            best_span = span
-
-    return best
+    start_wis = lists[0][0]
+    starts = ends = start_wis
+    for wis, _ in lists[1:]:
+        # Ends stay sorted as starts do, so the starts with no wi left in this layer
+        # form a suffix: drop it before bisecting.
+        n = bisect_left(ends, wis[-1])
+        if not n:
+            return None
+        starts = starts[:n]
+        ends = [wis[j] for j in map(partial(bisect_right, wis), islice(ends, n))]
+        # Starts that reach the same end share the rest of their chain, and the last of
+        # them has the strictly smaller span: drop the others.
+        keep = list(map(ne, ends, islice(ends, 1, None)))
+        keep.append(True)
+        starts = list(compress(starts, keep))
+        ends = list(compress(ends, keep))
+
+    spans = list(map(sub, ends, starts))
+    best = starts[spans.index(min(spans))]
+
+    # Rebuild the chain of the best start only
+    prev_wi = best
+    selection = [(prev_wi, lists[0][1][bisect_left(start_wis, best)])]
+    for wis, poss in lists[1:]:
+        j = bisect_right(wis, prev_wi)
+        prev_wi = wis[j]
+        selection.append((prev_wi, poss[j]))
+    return selection
 
 def capitalize_letter_in_word(word, pos):
     return word[:pos] + word[pos].upper() + word[pos+1:]
 
 
-# ==========================================
-# ================ EXAMPLES ================
-# ==========================================
-lyrics_1 = "...I bomb atomically, socrates, ^^^philosophies and hypoth&&&ses can't define h***ow I be dropping these mockeries..."
-band_name_1 = "cebi"
-
-lyrics_2 = """
-Alice was beginning to get very tired of sitting by her sister on the bank,
-and of having nothing to do: once or twice she had peeped into the book her
-sister was reading, but it had no pictures or conversations in it, “and what
-is the use of a book,” thought Alice “without pictures or conversations?”
-
-So she was considering in her own mind (as well as she could, for the hot day
-made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain
-would be worth the trouble of getting up and picking the daisies, when suddenly a
-White Rabbit with pink eyes ran close by her.
-"""
-band_name_2 = "alice"
-
-lyrics_3 = "a a a a a b b b b b c c c c c"
-band_name_3 = "abc"
-
-lyrics_4 = "aaaaa bbbbb x ccccc a bb c"
-band_name_4 = "abc"
-
-# Returns "CANNOT_ASSEMBLE" if band name longer than lyrics
-lyrics_5 = "aaa"
-band_name_5 = "aaaa"
-
-# Returns "CANNOT_ASSEMBLE" if band name not in lyrics
-lyrics_6 = "aaa bbb"
-band_name_6 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if band name empty
-lyrics_7 = ""
-band_name_7 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if lyrics empty
-lyrics_8 = ""
-band_name_8 = "aba"
-
-lyrics_9 = "zócalo ola kíndër ejemplo mañana tvityv tótem hjboyu internet niño gélido"
-band_name_9 = "Zoë Eñótié"
-
-lyrics_10 = "zócalo          ola kíndër ejemplo mañana          tvityv tótem hjboyu internet niño gélido"
-band_name_10 = "Zoë       Eñótié"
-
-lyrics_11 = "ﬁancé ① ＡＢＣ１２３ x² + y³"
-band_name_11 = "i1bx3"
-
-lyrics_12 = "Прекрасное объяснение. Тема сложная, конечно, но лучше никто объяснить не сможет."
-band_name_12 = "Т чл ибж"
-
-print(arrange_lyrics_improved(lyrics_1, band_name_1))
-print("\n")
-print(arrange_lyrics_improved(lyrics_2, band_name_2))
-print("\n")
-print(arrange_lyrics_improved(lyrics_3, band_name_3))
-print("\n")
-print(arrange_lyrics_improved(lyrics_4, band_name_4))
-print("\n")
-print(arrange_lyrics_improved(lyrics_5, band_name_5))
-print("\n")
-print(arrange_lyrics_improved(lyrics_6, band_name_6))
-print("\n")
-print(arrange_lyrics_improved(lyrics_7, band_name_7))
-print("\n")
-print(arrange_lyrics_improved(lyrics_8, band_name_8))
-print("\n")
-print(arrange_lyrics_improved(lyrics_9, band_name_9))
-print("\n")
-print(arrange_lyrics_improved(lyrics_10, band_name_10))
-print("\n")
-print(arrange_lyrics_improved(lyrics_11, band_name_11))
-print("\n")
-print(arrange_lyrics_improved(lyrics_12, band_name_12))
-print("\n")
-
-
-# ======================================
-# ================ TIMER ===============
-# ======================================
-import timeit
-
-N = 10000
-total = timeit.timeit(
-    stmt="arrange_lyrics_improved(lyrics, band_name)",
-    setup="""
-from __main__ import arrange_lyrics_improved
-lyrics = "Alice was beginning to get very tired of sitting by her sister on the bank, and of having nothing to do: once or twice she had peeped into the book hersister was reading, but it had no pictures or conversations in it, “and what is the use of a book,” thought Alice “without pictures or conversations?” So she was considering in her own mind (as well as she could, for the hot day made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain would be worth the trouble of getting up and picking the daisies, when suddenly a White Rabbit with pink eyes ran close by her."
-band_name = "alice"
-""",
-    number=N
-)
-
-avg_ms = (total / N) * 1000
-print(f"Average execution time: {avg_ms:.9f} ms")
\ No newline at end of file
+if __name__ == "__main__":
+  from lyrics_examples import print_average_time, print_examples
+
+  print_examples(arrange_lyrics_improved)
+  print_average_time(arrange_lyrics_improved)
@@ -1,4 +1,17 @@
-import re
+import string
+
+# bytes.translate table + delete set for the ASCII-encoded lyrics: keep [a-z0-9 ],
+# fold A-Z to lowercase, map "\n" to " ", delete every other byte.
+# Non-ASCII is dropped by the encode before translating.
+_CLEAN_TABLE = bytearray(range(256))
+for _ch in string.ascii_uppercase:
+  _CLEAN_TABLE[ord(_ch)] = ord(_ch.lower())
+_CLEAN_TABLE[ord("\n")] = ord(" ")
+_CLEAN_TABLE = bytes(_CLEAN_TABLE)
+_CLEAN_DELETE = bytes(
+  c for c in range(256) if chr(c) not in string.ascii_letters + string.digits + " \n"
+)
+del _ch
 
 def arrange_lyrics_original(lyrics, band_name):
   # Guard: empty input(s)
@@ -6,167 +19,90 @@ def arrange_lyrics_original(lyrics, band_name):
     return ""
   
   # 1) Clean + lowercase inputs
-  # split on \n and join on " "
-  lyrics = " ".join(lyrics.split("\n"))
-  lyrics = re.sub(r'[^a-zA-Z0-9 ]', '', lyrics).lower()
+  # Work on ASCII bytes from here on; one C-level bytes.translate does
+  # \n -> " ", keep [a-z0-9 ], fold A-Z to lowercase
+  lyrics = lyrics.encode("ascii", "ignore").translate(_CLEAN_TABLE, _CLEAN_DELETE)
+  # Collapse runs of spaces and trim, so consecutive words are exactly one space apart
+  # and a line can be sliced straight out of the cleaned text
+  if b"  " in lyrics:
+    lyrics = b" ".join(lyrics.split())
+  lyrics = lyrics.strip()
   
   band_name = band_name.lower()
 
-  # 2) Split to words
-  words = lyrics.split()
-
-  # Guard: band name longer than lyrics
-  if len(band_name) > len(words):
+  # Guard: band name longer than lyrics (words are single-space separated, so count spaces)
+  n_words = lyrics.count(b" ") + 1 if lyrics else 0
+  if len(band_name) > n_words:
     return ""
 
-  # 3) Greedily pick, in order, the earliest word that contains each needed letter.
-  #    Record: index of that word, and the index of the letter within that word.
-  word_idxs = []
-  letter_in_word_idxs = []
-  letter_index = 0
-  len_band_name = len(band_name)
-  for i, word in enumerate(words):
-    if letter_index == len_band_name:
-      break
-    j = word.find(band_name[letter_index])
-    if j != -1:
-      word_idxs.append(i)
-      letter_in_word_idxs.append(j)
-      # Capitalize the letter in the word
-      words[i] = word[:j] + word[j].upper() + word[j+1:]
-      letter_index += 1
-
-  # Guard: band name not fully in lyrics
-  if letter_index != len_band_name:
+  # Guard: a space can never be matched inside a word, and the cleaned lyrics are ASCII
+  if " " in band_name or not band_name.isascii():
     return ""
-
-  # 4) Construct lines
-  lines = []
-  for i in range(1, len(word_idxs)):
-    start_index = word_idxs[i-1]
-    end_index = word_idxs[i]
-    line = " ".join(words[start_index:end_index])
-    lines.append(line)
-  lines.append(words[word_idxs[-1]])
-
-  # 5) Determine padding to align vertically
+  band_name = band_name.encode("ascii")
+
+  # 2) Greedily pick, in order, the earliest word that contains each needed letter.
+  #    Every step is a C-level bytes.find/rfind over the cleaned text: find the letter,
+  #    rfind back to its word start, find forward to its word end (where the next
+  #    search resumes). No per-word Python work and no word index is ever built.
+  #    Record: start offset of that word, and the index of the letter within that word.
+  buf = bytearray(lyrics)
+  word_starts = []
+  letter_in_word_idxs = []
+  cursor = 0
+  for ch in band_name:
+    j = lyrics.find(ch, cursor)
+    # Guard: band name not fully in lyrics
+    if j == -1:
+      return ""
+    word_start = lyrics.rfind(b" ", 0, j) + 1
+    word_starts.append(word_start)
+    letter_in_word_idxs.append(j - word_start)
+    # Capitalize the letter in place (ASCII case flip; digits stay as they are)
+    if 97 <= buf[j] <= 122:
+      buf[j] ^= 0x20
+    cursor = lyrics.find(b" ", j)
+    if cursor == -1:
+      cursor = len(lyrics)
+
+  # 3) Construct lines (zero-copy views into the capitalized buffer)
+  #    Words are single-space separated, so a line ends right before the next anchor word;
+  #    the last line is just the last anchor word, which ends where the scan stopped.
+  text = memoryview(buf)
+  lines = [text[word_starts[i-1]:word_starts[i] - 1] for i in range(1, len(word_starts))]
+  lines.append(text[word_starts[-1]:cursor])
+
+  # 4) Determine padding to align vertically
   left_buffer = 0
   right_buffer = 0
   for i, line in enumerate(lines):
     left_buffer = max(left_buffer, letter_in_word_idxs[i])
     right_buffer = max(right_buffer, len(line) - 1 - letter_in_word_idxs[i])
 
-  # 6) Add the buffers to the lines
-  for i, line in enumerate(lines):
-    needed_left_buffer = left_buffer - letter_in_word_idxs[i]
-    needed_right_buffer = right_buffer - (len(line) - 1 - letter_in_word_idxs[i])
-    if not needed_left_buffer and not needed_right_buffer:
-      continue
-    line_left_buffer = " " * needed_left_buffer
-    line_right_buffer = " " * needed_right_buffer
-    lines[i] = line_left_buffer + line + line_right_buffer
-  
-  return "\n".join(lines)
-
-
-# ==========================================
-# ================ EXAMPLES ================
-# ==========================================
-lyrics_1 = "...I bomb atomically, socrates, ^^^philosophies and hypoth&&&ses can't define h***ow I be dropping these mockeries..."
-band_name_1 = "cebi"
-
-lyrics_2 = """
-Alice was beginning to get very tired of sitting by her sister on the bank,
-and of having nothing to do: once or twice she had peeped into the book her
-sister was reading, but it had no pictures or conversations in it, “and what
-is the use of a book,” thought Alice “without pictures or conversations?”
+  # 5) Add the buffers to the lines
+  #    Every padded line is exactly `width` wide.
+  width = left_buffer + right_buffer + 1
 
-So she was considering in her own mind (as well as she could, for the hot day
-made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain
-would be worth the trouble of getting up and picking the daisies, when suddenly a
-White Rabbit with pink eyes ran close by her.
-"""
-band_name_2 = "alice"
+  # Fast path: every letter already sits at column left_buffer and every line is full
+  # width (e.g. one-letter words), so no line needs padding
+  if min(letter_in_word_idxs) == left_buffer and all(len(line) == width for line in lines):
+    return b"\n".join(lines).decode("ascii")
 
-lyrics_3 = "a a a a a b b b b b c c c c c"
-band_name_3 = "abc"
-
-lyrics_4 = "aaaaa bbbbb x ccccc a bb c"
-band_name_4 = "abc"
-
-# Returns "CANNOT_ASSEMBLE" if band name longer than lyrics
-lyrics_5 = "aaa"
-band_name_5 = "aaaa"
-
-# Returns "CANNOT_ASSEMBLE" if band name not in lyrics
-lyrics_6 = "aaa bbb"
-band_name_6 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if band name empty
-lyrics_7 = ""
-band_name_7 = "aba"
-
-# Returns "CANNOT_ASSEMBLE" if lyrics empty
-lyrics_8 = ""
-band_name_8 = "aba"
-
-lyrics_9 = "zócalo ola kíndër ejemplo mañana tvityv tótem hjboyu internet niño gélido"
-band_name_9 = "Zoë Eñótié"
-
-lyrics_10 = "zócalo          ola kíndër ejemplo mañana          tvityv tótem hjboyu internet niño gélido"
-band_name_10 = "Zoë       Eñótié"
-
-lyrics_11 = "ﬁancé ① ＡＢＣ１２３ x² + y³"
-band_name_11 = "i1bx3"
-
-lyrics_12 = "Прекрасное объяснение. Тема сложная, конечно, но лучше никто объяснить не сможет."
-band_name_12 = "Т чл ибж"
+  #    Otherwise write them all into one space-filled buffer at fixed row offsets
+  #    instead of concatenating per line.
+  out = bytearray(b" ") * (len(lines) * (width + 1) - 1)
+  row = 0
+  for i, line in enumerate(lines):
+    col = row + left_buffer - letter_in_word_idxs[i]
+    out[col:col + len(line)] = line
+    row += width + 1
+    if row < len(out):
+      out[row - 1] = 10  # "\n"
 
-print(arrange_lyrics_original(lyrics_1, band_name_1))
-print("\n")
-print(arrange_lyrics_original(lyrics_2, band_name_2))
-print("\n")
-print(arrange_lyrics_original(lyrics_3, band_name_3))
-print("\n")
-print(arrange_lyrics_original(lyrics_4, band_name_4))
-print("\n")
-print(arrange_lyrics_original(lyrics_5, band_name_5))
-print("\n")
-print(arrange_lyrics_original(lyrics_6, band_name_6))
-print("\n")
-print(arrange_lyrics_original(lyrics_7, band_name_7))
-print("\n")
-print(arrange_lyrics_original(lyrics_8, band_name_8))
-print("\n")
-print(arrange_lyrics_original(lyrics_9, band_name_9))
-print("\n")
-print(arrange_lyrics_original(lyrics_10, band_name_10))
-print("\n")
-print(arrange_lyrics_original(lyrics_11, band_name_11))
-print("\n")
-print(arrange_lyrics_original(lyrics_12, band_name_12))
-print("\n")
+  return out.decode("ascii")
 
-# ======================================
-# ================ TIMER ===============
-# ======================================
-import timeit
 
-N = 10000
-total = timeit.timeit(
-    stmt="arrange_lyrics_original(lyrics, band_name)",
-    setup="""
-from __main__ import arrange_lyrics_original
-lyrics = \"\"\"Alice was beginning to get very tired of sitting by her sister on the bank, and of having nothing to do: once or 
-twice she had peeped into the book hersister was reading, but it had no pictures or conversations in it, 
-“and what is the use of a book,” thought Alice “without pictures or conversations?” So she was considering 
-in her own mind (as well as she could, for the hot day made her feel very sleepy and stupid), whether the pleasure
- of making a daisy-chain would be worth the trouble of getting up and picking the daisies, when suddenly a White Rabbit 
- with pink eyes ran close by her.\"\"\"
-band_name = "alice"
-""",
-    number=N
-)
+if __name__ == "__main__":
+  from lyrics_examples import print_average_time, print_examples
 
-avg_ms = (total / N) * 1000
-print(f"Average execution time: {avg_ms:.9f} ms")
\ No newline at end of file
+  print_examples(arrange_lyrics_original)
+  print_average_time(arrange_lyrics_original)
@@ -0,0 +1,91 @@
+"""
+Shared example inputs and demo/timer driver for the arrange_lyrics_* variants.
+Each variant imports this only under `if __name__ == "__main__":`, so importing a
+variant never runs the examples or the benchmark.
+"""
+import timeit
+
+# ==========================================
+# ================ EXAMPLES ================
+# ==========================================
+lyrics_1 = "...I bomb atomically, socrates, ^^^philosophies and hypoth&&&ses can't define h***ow I be dropping these mockeries..."
+band_name_1 = "cebi"
+
+lyrics_2 = """
+Alice was beginning to get very tired of sitting by her sister on the bank,
+and of having nothing to do: once or twice she had peeped into the book her
+sister was reading, but it had no pictures or conversations in it, “and what
+is the use of a book,” thought Alice “without pictures or conversations?”
+
+So she was considering in her own mind (as well as she could, for the hot day
+made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain
+would be worth the trouble of getting up and picking the daisies, when suddenly a
+White Rabbit with pink eyes ran close by her.
+"""
+band_name_2 = "alice"
+
+lyrics_3 = "a a a a a b b b b b c c c c c"
+band_name_3 = "abc"
+
+lyrics_4 = "aaaaa bbbbb x ccccc a bb c"
+band_name_4 = "abc"
+
+# Returns "CANNOT_ASSEMBLE" if band name longer than lyrics
+lyrics_5 = "aaa"
+band_name_5 = "aaaa"
+
+# Returns "CANNOT_ASSEMBLE" if band name not in lyrics
+lyrics_6 = "aaa bbb"
+band_name_6 = "aba"
+
+# Returns "CANNOT_ASSEMBLE" if band name empty
+lyrics_7 = ""
+band_name_7 = "aba"
+
+# Returns "CANNOT_ASSEMBLE" if lyrics empty
+lyrics_8 = ""
+band_name_8 = "aba"
+
+lyrics_9 = "zócalo ola kíndër ejemplo mañana tvityv tótem hjboyu internet niño gélido"
+band_name_9 = "Zoë Eñótié"
+
+lyrics_10 = "zócalo          ola kíndër ejemplo mañana          tvityv tótem hjboyu internet niño gélido"
+band_name_10 = "Zoë       Eñótié"
+
+lyrics_11 = "ﬁancé ① ＡＢＣ１２３ x² + y³"
+band_name_11 = "i1bx3"
+
+lyrics_12 = "Прекрасное объяснение. Тема сложная, конечно, но лучше никто объяснить не сможет."
+band_name_12 = "Т чл ибж"
+
+EXAMPLES = [
+    (lyrics_1, band_name_1),
+    (lyrics_2, band_name_2),
+    (lyrics_3, band_name_3),
+    (lyrics_4, band_name_4),
+    (lyrics_5, band_name_5),
+    (lyrics_6, band_name_6),
+    (lyrics_7, band_name_7),
+    (lyrics_8, band_name_8),
+    (lyrics_9, band_name_9),
+    (lyrics_10, band_name_10),
+    (lyrics_11, band_name_11),
+    (lyrics_12, band_name_12),
+]
+
+# ======================================
+# ================ TIMER ===============
+# ======================================
+TIMER_LYRICS = "Alice was beginning to get very tired of sitting by her sister on the bank, and of having nothing to do: once or twice she had peeped into the book hersister was reading, but it had no pictures or conversations in it, “and what is the use of a book,” thought Alice “without pictures or conversations?” So she was considering in her own mind (as well as she could, for the hot day made her feel very sleepy and stupid), whether the pleasure of making a daisy-chain would be worth the trouble of getting up and picking the daisies, when suddenly a White Rabbit with pink eyes ran close by her."
+TIMER_BAND_NAME = "alice"
+TIMER_N = 10000
+
+def print_examples(arrange):
+    for lyrics, band_name in EXAMPLES:
+        print(arrange(lyrics, band_name))
+        print("\n")
+
+def print_average_time(arrange, lyrics=TIMER_LYRICS, band_name=TIMER_BAND_NAME, number=TIMER_N):
+    total = timeit.timeit(lambda: arrange(lyrics, band_name), number=number)
+    avg_ms = (total / number) * 1000
+    print(f"Average execution time: {avg_ms:.9f} ms")